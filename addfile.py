@@ -17,6 +17,7 @@ Funzionalità:
 
 Esecuzione:
     python addfile.py nomefile.jpg --directory ./files
+    python addfile.py --filenames-from elenco.txt --directory ./files   (più file in un'unica esecuzione)
 
 Requisiti:
     - Python ≥ 3.6
@@ -34,8 +35,68 @@ import os           # per navigare nel filesystem: elencare file, controllare es
 import shutil       # per spostare o copiare file da una cartella all'altra
 import mimetypes    # per determinare il tipo MIME di un file (es. 'image/jpeg', 'audio/mpeg')
 import csv          # per leggere e scrivere file CSV (usato per generare il log recap.csv)
-import argparse     # per gestire argomenti passati da linea di comando (CLI)
 import sys          # per terminare lo script in caso di errori critici (es. sys.exit(1))
+import errno        # per riconoscere l'errore EXDEV (spostamento tra filesystem diversi)
+import stat         # per verificare dal risultato di os.stat che il percorso sia un file regolare
+import io           # per formattare una riga CSV in memoria prima di scriverla con os.write
+
+
+# Database MIME caricato una sola volta all'import: dopo init() guess_type non si reinizializza più
+# e il ciclo di listing usa direttamente la funzione già risolta
+mimetypes.init()
+_guess_type = mimetypes.guess_type
+
+# Tipo principale MIME (la parte prima di '/') -> sottocartella di destinazione
+_CATEGORIE = {
+    'audio': 'audio',
+    'image': 'immagini',
+    'application': 'documenti',
+    'text': 'documenti',
+}
+
+# Estensioni più comuni -> (tipo MIME, categoria), con gli stessi tipi restituiti da mimetypes:
+# per questi file non serve passare da guess_type, usato solo per le estensioni restanti
+_ESTENSIONI = {
+    '.mp3': ('audio/mpeg', 'audio'),
+    '.wav': ('audio/x-wav', 'audio'),
+    '.aac': ('audio/aac', 'audio'),
+    '.jpg': ('image/jpeg', 'immagini'),
+    '.jpeg': ('image/jpeg', 'immagini'),
+    '.png': ('image/png', 'immagini'),
+    '.gif': ('image/gif', 'immagini'),
+    '.bmp': ('image/bmp', 'immagini'),
+    '.tif': ('image/tiff', 'immagini'),
+    '.tiff': ('image/tiff', 'immagini'),
+    '.svg': ('image/svg+xml', 'immagini'),
+    '.pdf': ('application/pdf', 'documenti'),
+    '.txt': ('text/plain', 'documenti'),
+    '.csv': ('text/csv', 'documenti'),
+    '.html': ('text/html', 'documenti'),
+    '.json': ('application/json', 'documenti'),
+    '.zip': ('application/zip', 'documenti'),
+    '.doc': ('application/msword', 'documenti'),
+    '.xls': ('application/vnd.ms-excel', 'documenti'),
+    '.ppt': ('application/vnd.ms-powerpoint', 'documenti'),
+}
+
+# Intestazioni delle colonne di recap.csv
+INTESTAZIONI_CSV = ('Nome', 'Tipo', 'Size Byte', 'Percorso')
+
+# Riga di intestazione già pronta, identica a quella di csv.writer (nessun campo da quotare, fine riga '\r\n'),
+# per chi scrive recap.csv senza passare da un writer
+_RIGA_INTESTAZIONE_CSV = ','.join(INTESTAZIONI_CSV) + '\r\n'
+_INTESTAZIONE_CSV_BYTES = _RIGA_INTESTAZIONE_CSV.encode('utf-8')
+
+# Flag per l'append a basso livello su recap.csv: O_APPEND rende atomica ogni os.write anche con
+# più esecuzioni in parallelo; O_CLOEXEC e O_BINARY esistono solo su alcune piattaforme
+_FLAG_APPEND_CSV = os.O_WRONLY | os.O_APPEND | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+
+# Buffer di scrittura per recap.csv e ogni quante righe svuotarlo su disco in modalità batch
+_BUFFER_CSV = 64 * 1024
+_RIGHE_PER_FLUSH = 128
+
+# Cartelle di categoria già create o verificate in questo processo (utile quando si spostano più file)
+_CARTELLE_ESISTENTI = set()
 
 
 def get_mime_type(file_path):
@@ -49,7 +110,7 @@ def get_mime_type(file_path):
         mime_type: stringa del tipo MIME (es. 'image/png')
         size: dimensione in byte
     """
-    mime_type, _ = mimetypes.guess_type(file_path)
+    mime_type, _ = _guess_type(file_path)
     if mime_type is None:
         mime_type = 'Tipo sconosciuto'
     size = os.path.getsize(file_path)
@@ -62,14 +123,130 @@ def classifica_file(mime_type):
     """
     if mime_type is None:
         return None
-    if mime_type.startswith('audio'):
-        return 'audio'
-    elif mime_type.startswith('image'):
-        return 'immagini'
-    elif mime_type.startswith('application') or mime_type.startswith('text'):
-        return 'documenti'
-    else:
-        return None  # tipo sconosciuto
+    # Una sola ricerca nel dizionario al posto della catena di startswith; None se tipo sconosciuto
+    return _CATEGORIE.get(mime_type.split('/', 1)[0])
+
+def tipo_e_categoria(filename):
+    """
+    Restituisce tipo MIME e categoria di un file a partire dal nome.
+    Le estensioni più comuni sono risolte con la tabella _ESTENSIONI, le altre con mimetypes.
+
+    Args:
+        filename: nome del file (basta il nome, conta solo l'estensione)
+    Returns:
+        mime_type: stringa del tipo MIME oppure None se sconosciuto
+        categoria: 'audio', 'immagini', 'documenti' oppure None se non riconosciuto
+    """
+    # Come os.path.splitext, i punti iniziali non aprono un'estensione ('.jpg' non ne ha);
+    # nei casi dubbi si lascia decidere a mimetypes
+    i = filename.rfind('.')
+    if i > 0 and filename[i - 1] != '.':
+        trovato = _ESTENSIONI.get(filename[i:].lower())
+        if trovato is not None:
+            return trovato
+    mime_type = _guess_type(filename)[0]
+    return mime_type, classifica_file(mime_type)
+
+def elenca_file_disponibili(folder_path):
+    """
+    Scandisce la cartella e restituisce i file spostabili con la relativa categoria.
+    os.scandir riusa il tipo restituito dalla lettura della directory: niente stat() per ogni file.
+
+    Args:
+        folder_path: percorso della cartella principale (es. './files')
+    Returns:
+        dizionario nome file -> (DirEntry, mime_type, categoria); la dimensione si ottiene da
+        entry.stat(follow_symlinks=False), che viene eseguita solo se serve e poi resta in cache
+    Raises:
+        OSError: se la cartella non esiste, non è una directory o non è accessibile
+    """
+    available_files = {}
+    tipo = tipo_e_categoria
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if entry.name == 'recap.csv' or not entry.is_file(follow_symlinks=False):
+                continue
+            # Conta solo l'estensione, basta il nome del file
+            mime_type, categoria = tipo(entry.name)
+            if categoria is not None:
+                available_files[entry.name] = (entry, mime_type, categoria)
+    return available_files
+
+def analizza_file(folder_path, filename):
+    """
+    Verifica un singolo file della cartella con una sola stat(), senza scandire la directory.
+
+    Args:
+        folder_path: percorso della cartella principale (es. './files')
+        filename: nome del file (senza percorso) all'interno della cartella
+    Returns:
+        tupla (mime_type, size, categoria), oppure None se il file non esiste,
+        non è un file regolare o il suo tipo non è supportato
+    """
+    # Solo file direttamente contenuti nella cartella, come nell'elenco di elenca_file_disponibili
+    if filename == 'recap.csv' or os.path.basename(filename) != filename:
+        return None
+    try:
+        st = os.stat(os.path.join(folder_path, filename), follow_symlinks=False)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    mime_type, categoria = tipo_e_categoria(filename)
+    if categoria is None:
+        return None
+    return mime_type, st.st_size, categoria
+
+def _sposta_tra_filesystem(file_path, nuovo_percorso):
+    """
+    Sposta un file su un filesystem diverso: copia con os.sendfile (interamente nel kernel,
+    senza passare da un buffer Python) e poi cancella l'originale.
+    Dove sendfile non supporta file regolari come destinazione (fuori da Linux), o fallisce già
+    alla prima chiamata (alcuni filesystem come FUSE o eCryptfs), usa shutil.move.
+    """
+    if not sys.platform.startswith('linux'):
+        shutil.move(file_path, nuovo_percorso)
+        return
+
+    usa_shutil = False
+    # Il sorgente si apre per primo: se non è leggibile la destinazione resta intatta
+    with open(file_path, 'rb') as src:
+        # Come shutil: blocchi grandi almeno quanto il file, ma si copia finché sendfile restituisce 0,
+        # così anche eventuali byte aggiunti al sorgente durante la copia non vanno persi
+        blocco = max(os.fstat(src.fileno()).st_size, 8 * 1024 * 1024)
+        dst = open(nuovo_percorso, 'wb')
+        try:
+            with dst:
+                offset = 0
+                while True:
+                    try:
+                        inviati = os.sendfile(dst.fileno(), src.fileno(), offset, blocco)
+                    except OSError:
+                        # Se sendfile non funziona fin dall'inizio si lascia fare a shutil.move
+                        if offset != 0:
+                            raise
+                        usa_shutil = True
+                        break
+                    if inviati == 0:
+                        break
+                    offset += inviati
+            if not usa_shutil:
+                # Mantiene date e permessi come shutil.move
+                shutil.copystat(file_path, nuovo_percorso)
+        except BaseException:
+            # Non lascia copie parziali nella cartella di destinazione (aperta qui in scrittura)
+            try:
+                os.unlink(nuovo_percorso)
+            except OSError:
+                pass
+            raise
+
+    if usa_shutil:
+        # La destinazione vuota creata qui viene rimossa prima di ripiegare su shutil.move
+        os.unlink(nuovo_percorso)
+        shutil.move(file_path, nuovo_percorso)
+        return
+    os.unlink(file_path)
 
 def sposta_file(file_path, folder_path, categoria):
     """
@@ -83,61 +260,148 @@ def sposta_file(file_path, folder_path, categoria):
     """
     destinazione_cartella = os.path.join(folder_path, categoria)
 
-    # Crazione cartella categoria se non esiste
-    if not os.path.exists(destinazione_cartella):
-        os.makedirs(destinazione_cartella)
+    # Crazione cartella categoria se non esiste (exist_ok evita il controllo preventivo e la race);
+    # una volta creata non viene più richiesta al filesystem per il resto del processo
+    if destinazione_cartella not in _CARTELLE_ESISTENTI:
+        os.makedirs(destinazione_cartella, exist_ok=True)
+        _CARTELLE_ESISTENTI.add(destinazione_cartella)
 
     # Costruzione nuovo percorso file
     nome_file = os.path.basename(file_path)
-    nuovo_percorso = os.path.join(destinazione_cartella, nome_file)
+    # destinazione_cartella termina sempre con il nome della categoria e nome_file è un nome semplice:
+    # la concatenazione con os.sep dà lo stesso risultato di os.path.join senza i suoi controlli
+    nuovo_percorso = destinazione_cartella + os.sep + nome_file
 
-    # Sposta il file nella nuova posizione
-    shutil.move(file_path, nuovo_percorso)
+    # Sposta il file nella nuova posizione: sullo stesso filesystem basta una rename atomica,
+    # tra filesystem diversi (EXDEV) si ripiega su una copia seguita dalla cancellazione
+    try:
+        try:
+            os.replace(file_path, nuovo_percorso)
+        except FileNotFoundError:
+            # La cartella in cache potrebbe essere stata cancellata o rinominata nel frattempo:
+            # la si ricrea e si riprova una volta sola
+            _CARTELLE_ESISTENTI.discard(destinazione_cartella)
+            os.makedirs(destinazione_cartella, exist_ok=True)
+            _CARTELLE_ESISTENTI.add(destinazione_cartella)
+            os.replace(file_path, nuovo_percorso)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _sposta_tra_filesystem(file_path, nuovo_percorso)
 
     # Percorso file
     return nuovo_percorso 
 
-def scrivi_log_csv(file_info, csv_path):
+def apri_log_csv(csv_path):
+    """
+    Apre il file recap.csv in modalità append una sola volta, così più righe
+    possono essere scritte senza riaprire il file a ogni chiamata.
+
+    Args:
+        csv_path: percorso del file recap.csv
+    Returns:
+        csvfile: file aperto, da chiudere a cura del chiamante
+        writer: csv.writer associato al file
+        scrivi_intestazione: True se il file non esisteva e va scritta l'intestazione
+    """
+    # Prova a creare il file (modalità 'x'): se esiste già si ripiega sull'append,
+    # senza una stat() preventiva solo per sapere se serve l'intestazione
+    try:
+        csvfile = open(csv_path, mode='x', newline='', encoding='utf-8', buffering=_BUFFER_CSV)
+        scrivi_intestazione = True
+    except FileExistsError:
+        csvfile = open(csv_path, mode='a', newline='', encoding='utf-8', buffering=_BUFFER_CSV)
+        scrivi_intestazione = False
+    writer = csv.writer(csvfile)
+    return csvfile, writer, scrivi_intestazione
+
+def scrivi_log_csv(file_info, writer, write_header):
     """
     Scrive una riga nel file CSV con le informazioni sul file spostato.
 
     Args:
-        file_info: dizionario con le chiavi 'Nome', 'Tipo', 'Size'
+        file_info: tupla (nome, tipo MIME, dimensione in byte, percorso) nell'ordine di INTESTAZIONI_CSV
+        writer: csv.writer già aperto (vedi apri_log_csv)
+        write_header: True per scrivere prima l'intestazione
+    """
+    # Scrive l’intestazione solo se il file non esisteva
+    if write_header:
+        writer.writerow(INTESTAZIONI_CSV)
+
+    # Scrive la riga del file corrente
+    writer.writerow(file_info)
+
+def registra_log_csv(file_info, csv_path):
+    """
+    Variante per un singolo file: aggiunge la riga a recap.csv con una sola os.write su un
+    descrittore aperto in O_APPEND, senza i livelli di buffer e codifica di open().
+
+    Args:
+        file_info: tupla (nome, tipo MIME, dimensione in byte, percorso)
         csv_path: percorso del file recap.csv
     """
-    # Verifica se il file recap.csv esiste già
-    file_esiste = os.path.exists(csv_path)
+    # La riga viene formattata da csv.writer (stesse virgolette e fine riga del writer su file)
+    # e codificata prima di aprire il file: se la codifica fallisce recap.csv non viene toccato
+    buffer = io.StringIO()
+    scrivi_log_csv(file_info, csv.writer(buffer), False)
+    riga = buffer.getvalue().encode('utf-8')
 
-    # Apre il file in modalità append (aggiunta)
-    with open(csv_path, mode='a', newline='', encoding='utf-8') as csvfile:
-        # Definisce le intestazioni
-        intestazioni = ['Nome', 'Tipo', 'Size Byte','Percorso']
-        
-        # Crea il writer
-        writer = csv.DictWriter(csvfile, fieldnames=intestazioni)
+    # Prova a creare il file: se esiste già si apre in append e l'intestazione non serve
+    try:
+        fd = os.open(csv_path, _FLAG_APPEND_CSV | os.O_CREAT | os.O_EXCL, 0o666)
+        dati = _INTESTAZIONE_CSV_BYTES + riga
+    except FileExistsError:
+        fd = os.open(csv_path, _FLAG_APPEND_CSV)
+        dati = riga
 
-        # Scrive l’intestazione solo se il file non esisteva
-        if not file_esiste:
-            writer.writeheader()
-        
-        # Scrive la riga del file corrente
-        writer.writerow(file_info)
+    try:
+        while dati:
+            scritti = os.write(fd, dati)
+            dati = dati[scritti:]
+    finally:
+        os.close(fd)
 
 
 
-def main():
+def _parse_args_veloce(argv):
     """
-    Funzione principale che gestisce l'organizzazione di un singolo file tramite CLI:
-    lo classifica, sposta e registra un log nel file recap.csv.
+    Riconosce le forme più comuni della CLI senza importare argparse:
+    [nomefile] [-d CARTELLA] con -d/--directory prima o dopo il nome file.
+    Per tutto il resto (-h, --filenames-from, input non valido) restituisce None
+    e il parsing passa ad argparse.
 
     Args:
-        folder_path: percorso alla cartella principale (es. './files')
+        argv: argomenti da linea di comando senza il nome dello script
+    Returns:
+        tupla (filename, directory), ciascuno None se assente, oppure None
+    """
+    filename = directory = None
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-d', '--directory') and directory is None and i + 1 < len(argv):
+            directory = argv[i + 1]
+            if directory.startswith('-'):
+                return None
+            i += 2
+        elif not arg.startswith('-') and filename is None:
+            filename = arg
+            i += 1
+        else:
+            return None
+    return filename, directory
+
+def parse_args():
     """
+    Definisce l'interfaccia CLI e restituisce gli argomenti letti da linea di comando.
+    """
+    # Importato qui: serve solo per l'help, --filenames-from o input non riconosciuto da _parse_args_veloce
+    import argparse     # per gestire argomenti passati da linea di comando (CLI)
 
-    # Definizione e parsing degli argomenti CLI in un'unica soluzione
     parser = argparse.ArgumentParser(
         description="Sposta un file in base alla tipologia MIME all'interno della relativa sotto cartella e crea un file recap.csv per il log",
         epilog="Esempio:\n  python addfile.py nomefile -d ./cartella\n"
+               "  python addfile.py --filenames-from elenco.txt -d ./cartella\n"
                "Suggerimento:\n"
                "  Per conoscere i file validi spostabili in una cartella, esegui senza 'nomefile':\n"
                "  python addfile.py -d ./files",
@@ -146,94 +410,219 @@ def main():
 
     parser.add_argument('filename', nargs='?', help="Nome del file da spostare (obbligatorio)")
     parser.add_argument('-d', '--directory', type=str, help="Cartella da organizzare (es. './files')")
+    parser.add_argument('--filenames-from', metavar='FILE',
+                        help="File di testo con un nome file per riga da spostare in un'unica esecuzione")
 
     args = parser.parse_args()
+    if args.filename and args.filenames_from:
+        parser.error("indicare 'nomefile' oppure --filenames-from, non entrambi")
+    return args
+
+def processa_file(folder_path, filename, info_file):
+    """
+    Sposta un file già verificato con analizza_file nella sottocartella della sua categoria.
+
+    Args:
+        folder_path: percorso della cartella principale (es. './files')
+        filename: nome del file all'interno della cartella
+        info_file: tupla (mime_type, size, categoria) restituita da analizza_file
+    Returns:
+        riga per recap.csv nell'ordine di INTESTAZIONI_CSV: (nome, tipo MIME, dimensione, percorso)
+    """
+    mime_type, size, categoria = info_file
+    nuovo_percorso = sposta_file(os.path.join(folder_path, filename), folder_path, categoria)
+    return filename, mime_type, size, nuovo_percorso
+
+def sposta_e_registra(folder_path, filename, mime_type, size, categoria, writer, write_header=False):
+    """
+    Punto di ingresso per chi usa il modulo come libreria e conosce già tipo, dimensione e
+    categoria del file (ad esempio da una propria os.scandir): sposta il file e aggiunge la
+    riga a recap.csv, senza scandire di nuovo la cartella né ripetere stat() sul file.
+
+    Args:
+        folder_path: percorso della cartella principale (es. './files')
+        filename: nome del file all'interno della cartella
+        mime_type: tipo MIME del file (es. 'image/png')
+        size: dimensione in byte
+        categoria: 'audio', 'immagini' o 'documenti' (vedi classifica_file)
+        writer: csv.writer già aperto su recap.csv (vedi apri_log_csv)
+        write_header: True per scrivere prima l'intestazione
+    Returns:
+        nuovo_percorso: percorso del file dopo lo spostamento
+    """
+    nuovo_percorso = sposta_file(os.path.join(folder_path, filename), folder_path, categoria)
+    scrivi_log_csv((filename, mime_type, size, nuovo_percorso), writer, write_header)
+    return nuovo_percorso
+
+def stampa_riepilogo(file_info, categoria, csv_path):
+    """
+    Stampa il riepilogo dell'operazione eseguita su un file.
+    """
+    filename, mime_type, size, nuovo_percorso = file_info
+    print(f"\n--- Riepilogo Operazione ---")
+    print(f"Nome: {filename}")
+    print(f"Tipo: {mime_type}")
+    print(f"Dimensione: {size} byte")
+    print(f"Categoria: {categoria}/")
+    print(f"Percorso aggiornato: {nuovo_percorso}")
+    print(f"Log registrato in: {csv_path}")
+    print("-" * 40)
+
+def main_batch(filenames, folder_path):
+    """
+    Sposta più file della stessa cartella in un'unica esecuzione: parsing della CLI,
+    caricamento dei tipi MIME e apertura di recap.csv avvengono una volta sola.
+
+    Args:
+        filenames: nomi dei file da spostare
+        folder_path: percorso della cartella principale (es. './files')
+    Returns:
+        numero di file non spostati
+    """
+    if not folder_path:
+        print(f"Errore: la cartella '{folder_path}' non esiste o non è accessibile.")
+        return len(filenames)
+
+    csv_path = os.path.join(folder_path, 'recap.csv')
+    csvfile = writer = None
+    try:
+        csvfile, writer, scrivi_intestazione = apri_log_csv(csv_path)
+    except (FileNotFoundError, NotADirectoryError):
+        print(f"Errore: la cartella '{folder_path}' non esiste o non è accessibile.")
+        return len(filenames)
+    except OSError as e:
+        # Problema del solo recap.csv (es. in sola lettura o una directory): come nella modalità
+        # a file singolo i file vengono spostati comunque, senza registrarli nel log
+        print(f"Errore durante la scrittura del log nel file '{csv_path}': {e}")
+
+    errori = 0
+    righe_scritte = 0
+    # Le righe si accumulano nel buffer e vengono scritte su disco ogni _RIGHE_PER_FLUSH;
+    # il finally chiude (e quindi svuota) il file anche in caso di errore o interruzione
+    try:
+        # Un recap.csv appena creato riceve subito l'intestazione, anche se poi nessun file viene spostato:
+        # altrimenti resterebbe vuoto e le esecuzioni successive vi aggiungerebbero righe senza intestazione
+        if csvfile is not None and scrivi_intestazione:
+            try:
+                csvfile.write(_RIGA_INTESTAZIONE_CSV)
+                csvfile.flush()
+            except Exception as e:
+                print(f"Errore durante la scrittura del log nel file '{csv_path}': {e}")
+
+        for filename in filenames:
+            info_file = analizza_file(folder_path, filename)
+            if info_file is None:
+                print(f"Errore: Il file '{filename}' non è valido o non è presente nella cartella '{folder_path}' "
+                      "o il suo tipo non è supportato.")
+                errori += 1
+                continue
+
+            try:
+                file_info = processa_file(folder_path, filename, info_file)
+            except Exception as e:
+                print(f"Errore durante lo spostamento del file '{filename}': {e}")
+                errori += 1
+                continue
+
+            if writer is not None:
+                try:
+                    scrivi_log_csv(file_info, writer, False)
+                    righe_scritte += 1
+                    if righe_scritte % _RIGHE_PER_FLUSH == 0:
+                        csvfile.flush()
+                except Exception as e:
+                    # Non blocca l'esecuzione se il file è già stato spostato
+                    print(f"Errore durante la scrittura del log nel file '{csv_path}': {e}")
+
+            stampa_riepilogo(file_info, info_file[2], csv_path)
+    finally:
+        if csvfile is not None:
+            csvfile.close()
+    return errori
+
+def main():
+    """
+    Funzione principale che gestisce l'organizzazione di un singolo file tramite CLI:
+    lo classifica, sposta e registra un log nel file recap.csv.
+    Con --filenames-from elabora più file in un'unica esecuzione (vedi main_batch).
+    """
+    # Le forme semplici della CLI evitano l'import e la costruzione del parser argparse
+    veloce = _parse_args_veloce(sys.argv[1:])
+    if veloce is not None:
+        filename, folder_path = veloce
+        filenames_from = None
+    else:
+        args = parse_args()
+        filename, folder_path, filenames_from = args.filename, args.directory, args.filenames_from
 
     # Gestione della cartella: priorità alla CLI, altrimenti input utente
-    folder_path = args.directory
     if not folder_path:
         folder_path = input("Inserisci il percorso della cartella da organizzare (es. ./files): ")
 
-    if not os.path.isdir(folder_path):
+    # Un percorso vuoto verrebbe risolto nella cartella corrente: non è una cartella valida
+    if not folder_path:
         print(f"Errore: la cartella '{folder_path}' non esiste o non è accessibile.")
         sys.exit(1)
 
-    # Filtra i file spostabili e gestisce l'opzione di listing (senza filename)
-    tipi_validi = ('image', 'audio', 'text', 'application')
-    available_files = []
-    for f in os.listdir(folder_path):
-        full_path = os.path.join(folder_path, f)
-        if os.path.isfile(full_path) and f != 'recap.csv':
-            mime_info = mimetypes.guess_type(full_path)
-            if mime_info[0] and mime_info[0].split('/')[0] in tipi_validi:
-                available_files.append(f)
-    available_files.sort()
-
-    # Se non è stato fornito un nome file, elenca i file disponibili e termina
-    if not args.filename:
-        if available_files:
-            print(f"File disponibili nella cartella '{folder_path}' da spostare:")
-            for f in available_files:
-                print(f"  - {f}")
-        else:
-            print(f"Nessun file valido da spostare trovato nella cartella '{folder_path}'.")
-        sys.exit(0)
-
-    # Validazione del nome file fornito
-    filename = args.filename
-    if filename not in available_files:
+    # Modalità batch: un nome file per riga, righe vuote ignorate
+    if filenames_from:
+        try:
+            with open(filenames_from, encoding='utf-8') as elenco:
+                filenames = [riga.strip() for riga in elenco if riga.strip()]
+        except OSError as e:
+            print(f"Errore nella lettura dell'elenco dei file '{filenames_from}': {e}")
+            sys.exit(1)
+        sys.exit(1 if main_batch(filenames, folder_path) else 0)
+
+    # Con un nome file indicato basta una stat() su quel file: la cartella viene scandita
+    # solo per l'elenco (senza filename) o per suggerire i file validi in caso di errore
+    info_file = analizza_file(folder_path, filename) if filename else None
+
+    if info_file is None:
+        # Filtra i file spostabili; l'ordinamento serve solo quando si stampa l'elenco.
+        # Nessun controllo preventivo con os.path.isdir: è scandir stesso a fallire se la cartella non va bene
+        try:
+            available_files = elenca_file_disponibili(folder_path)
+        except OSError:
+            print(f"Errore: la cartella '{folder_path}' non esiste o non è accessibile.")
+            sys.exit(1)
+
+        # Se non è stato fornito un nome file, elenca i file disponibili e termina
+        if not filename:
+            if available_files:
+                print(f"File disponibili nella cartella '{folder_path}' da spostare:")
+                for f in sorted(available_files):
+                    print(f"  - {f}")
+            else:
+                print(f"Nessun file valido da spostare trovato nella cartella '{folder_path}'.")
+            sys.exit(0)
+
+        # Il nome file fornito non è valido
         print(f"Errore: Il file '{filename}' non è valido o non è presente nella cartella '{folder_path}' "
               "o il suo tipo non è supportato.")
         if available_files:
             print("File disponibili:")
-            for f in available_files:
+            for f in sorted(available_files):
                 print(f"  - {f}")
         sys.exit(1)
 
     # Processamento del file
-    file_path = os.path.join(folder_path, filename)
-
-    try:
-        mime_type, size = get_mime_type(file_path)
-    except Exception as e:
-        print(f"Errore nel rilevare il tipo MIME o la dimensione del file '{filename}': {e}")
-        sys.exit(1)
-
-    categoria = classifica_file(mime_type)
-
-    if categoria is None:
-        print(f"File '{filename}' di tipo '{mime_type}' non riconosciuto, nessuna azione eseguita.")
-        sys.exit(0) # Non è un errore critico, solo un file non gestibile
-
     try:
-        nuovo_percorso = sposta_file(file_path, folder_path, categoria)
+        file_info = processa_file(folder_path, filename, info_file)
     except Exception as e:
         print(f"Errore durante lo spostamento del file '{filename}': {e}")
         sys.exit(1)
 
-    file_info = {
-        'Nome': filename,
-        'Tipo': mime_type,
-        'Size Byte': size,
-        'Percorso': nuovo_percorso
-    }
-
     csv_path = os.path.join(folder_path, 'recap.csv')
     try:
-        scrivi_log_csv(file_info, csv_path)
+        # Un solo file da registrare: append diretto con os.write (vedi registra_log_csv)
+        registra_log_csv(file_info, csv_path)
     except Exception as e:
         print(f"Errore durante la scrittura del log nel file '{csv_path}': {e}")
         # Non blocca l'esecuzione se il file è già stato spostato
         pass
 
-    print(f"\n--- Riepilogo Operazione ---")
-    print(f"Nome: {filename}")
-    print(f"Tipo: {mime_type}")
-    print(f"Dimensione: {size} byte")
-    print(f"Categoria: {categoria}/")
-    print(f"Percorso aggiornato: {nuovo_percorso}")
-    print(f"Log registrato in: {csv_path}")
-    print("-" * 40)
+    stampa_riepilogo(file_info, info_file[2], csv_path)
 
 
 if __name__=='__main__':